@@ -1,10 +1,9 @@
 import pypandoc
-from bs4 import BeautifulSoup
+from lxml import etree
 from epubcheck import EpubCheck
 from typing import Optional, Literal, List
 from pathlib import Path
 import os
-import re
 import base64
 import filetype
 
@@ -47,11 +46,13 @@ class CreateWork:
         if self.stateless:
             _c.check_path(self.directory)
         # Load metadata settings, if exists
-        try:
-            _c.check_source(self.directory / _c.DEFAULT_METADATA_SETTINGS)
-            self.metadata = WorkMetadata(_c.load_json(self.directory / _c.DEFAULT_METADATA_SETTINGS))
+        settings_path = self.directory / _c.DEFAULT_METADATA_SETTINGS
+        if settings_path.is_file():
+            # Unset terms are not saved, but settings from earlier versions may record them as `null`
+            settings = {k: v for k, v in _c.load_json(settings_path).items() if v is not None}
+            self.metadata = WorkMetadata(**settings)
             self.work_name = self.directory.name  # Since will be `.../work-name/`
-        except FileNotFoundError:
+        else:
             self.metadata = None
             self.work_name = None
         # Construct the metadata, if it is provided
@@ -59,7 +60,7 @@ class CreateWork:
             if isinstance(metadata, WorkMetadata):
                 metadata = metadata.model_dump()
             self.set_metadata(metadata)
-        self.source_path = _c.get_helper_path() / "data"
+        self.source_path = _c.DEFAULT_DATA_DIRECTORY
         # Set default cover and work bytes
         self.work = None
         self.cover = None
@@ -121,7 +122,9 @@ class CreateWork:
         if self.stateless:
             _c.check_path(self.directory)
             _c.save_json(
-                self.metadata.model_dump(by_alias=True), self.directory / _c.DEFAULT_METADATA_SETTINGS, overwrite=True
+                self.metadata.model_dump(by_alias=True, exclude_none=True),
+                self.directory / _c.DEFAULT_METADATA_SETTINGS,
+                overwrite=True,
             )
         return True
 
@@ -147,7 +150,6 @@ class CreateWork:
             raise PermissionError(e)
         if isinstance(source, Path):
             try:
-                _c.check_source(source)
                 with open(source, "rb") as f:
                     source = f.read()
             except FileNotFoundError:
@@ -155,9 +157,9 @@ class CreateWork:
                 raise FileNotFoundError(e)
         if isinstance(source, str) and base_type:
             # Base64 string, remove any provided mime type
-            source_type = re.search(_c.DEFAULT_BASE64_TYPES[base_type], source)
+            source_type = _c.DEFAULT_BASE64_TYPES[base_type].match(source)
             if source_type:
-                source = source.replace(source_type.group(0), "")
+                source = source[source_type.end() :]
             source = base64.b64decode(source)
         if not isinstance(source, bytes):
             e = "File is not valid."
@@ -215,7 +217,9 @@ class CreateWork:
             with open(self.directory / f"cover.{kind}", "wb") as w:
                 w.write(source)
             _c.save_json(
-                self.metadata.model_dump(by_alias=True), self.directory / _c.DEFAULT_METADATA_SETTINGS, overwrite=True
+                self.metadata.model_dump(by_alias=True, exclude_none=True),
+                self.directory / _c.DEFAULT_METADATA_SETTINGS,
+                overwrite=True,
             )
         else:
             self.cover = source
@@ -247,7 +251,9 @@ class CreateWork:
             self.metadata.contributor = []
         self.metadata.contributor.append(Contributor(**contributor))
         _c.save_json(
-            self.metadata.model_dump(by_alias=True), self.directory / _c.DEFAULT_METADATA_SETTINGS, overwrite=True
+            self.metadata.model_dump(by_alias=True, exclude_none=True),
+            self.directory / _c.DEFAULT_METADATA_SETTINGS,
+            overwrite=True,
         )
 
     def set_dedication(self, dedication: str | list[str]):
@@ -262,7 +268,7 @@ class CreateWork:
             raise PermissionError(e)
         self.dedication = pages.create_dedication_xhtml(dedication)
         if self.stateless:
-            with open(self.directory / "dedication.xhtml", "w") as w:
+            with open(self.directory / "dedication.xhtml", "w", encoding="utf-8") as w:
                 w.write(self.dedication)
 
     def set_rights(self, rights: str | list[str]):
@@ -303,7 +309,9 @@ class CreateWork:
             rights = [rights]
         self.metadata.long_rights = rights
         _c.save_json(
-            self.metadata.model_dump(by_alias=True), self.directory / _c.DEFAULT_METADATA_SETTINGS, overwrite=True
+            self.metadata.model_dump(by_alias=True, exclude_none=True),
+            self.directory / _c.DEFAULT_METADATA_SETTINGS,
+            overwrite=True,
         )
 
     ############################################################################
@@ -378,11 +386,11 @@ class CreateWork:
                     REMOVES.append(chapter)
                 # Restructure chapter xml into standard format
                 chapter_xml = pages.restructure_chapter(chapter_xml, str(i))
-                chapter_title = chapter_xml.title.string
-                # Count the words (XHTML and HTML treated differently by BeautifulSoup, so first extract `section`)
-                words = BeautifulSoup(str(chapter_xml.section), features="xml").get_text()
-                self.metadata.word_count += len(words.replace("\n", " ").replace("  ", " ").strip().split())
-                w.writestr(file_as, str(chapter_xml))
+                chapter_title = chapter_xml.findtext(".//{*}title")
+                # Count the words in the `section` only; `str.split` already collapses all whitespace
+                words = "".join(chapter_xml.find(".//{*}section").itertext())
+                self.metadata.word_count += len(words.split())
+                w.writestr(file_as, etree.tostring(chapter_xml, encoding="utf-8", xml_declaration=True))
                 spine.append(Matter(partition=MatterPartition.body, title=chapter_title))
             # PANDOC MAY STILL ADD IMAGES FOUND IN THE WORK WHICH WE NEED TO DISCOVER AND ADD TO THE MANIFEST
             # NOTE, these are not only to be added to the manifest, but the folder renamed as well
@@ -3,16 +3,10 @@ Miscellaneous tools for supporting core functionality.
 """
 
 import json
+import re
 from urllib.parse import urlparse
 from pathlib import Path
 from typing import Optional, Union, Any
-import locale
-
-try:
-    locale.setlocale(locale.LC_ALL, "en_US.UTF-8")
-except locale.Error:
-    # Readthedocs has a problem, but difficult to replicate
-    locale.setlocale(locale.LC_ALL, "")
 
 # https://github.com/python/typing/issues/182
 JSONType = Union[str, int, float, bool, None, dict[str, Any], list[Any]]
@@ -22,18 +16,19 @@ JSONType = Union[str, int, float, bool, None, dict[str, Any], list[Any]]
 ###################################################################################################
 
 DEFAULT_BASE64_TYPES = {
-    "cover": r"^data:image\/(png|jpe?g);base64,",
-    "work": "data:application/vnd.openxmlformats-officedocument.wordprocessingml.document;base64,",
+    "cover": re.compile(r"^data:image/(png|jpe?g);base64,"),
+    "work": re.compile(r"^data:application/vnd\.openxmlformats-officedocument\.wordprocessingml\.document;base64,"),
 }
 DEFAULT_METADATA_SETTINGS = "work_metadata.json"
-DEFAULT_DATA_DIRECTORY = Path(__file__).resolve().parent / "data"
+DEFAULT_HELPER_DIRECTORY = Path(__file__).parent
+DEFAULT_DATA_DIRECTORY = DEFAULT_HELPER_DIRECTORY / "data"
 
 
 def get_helper_path():
     """
     Get the Chapisha helper path. Used, usually, when needing template resources in the helpers folder.
     """
-    return Path(__file__).resolve().parent
+    return DEFAULT_HELPER_DIRECTORY
 
 
 def check_path(directory: str):
@@ -48,14 +43,14 @@ def check_path(directory: str):
     Path(directory).mkdir(parents=True, exist_ok=True)
 
 
-def check_source(source: str) -> bool:
+def check_source(source: str | Path) -> bool:
     """
     Check whether a source file exists.
 
     Parameters
     ----------
-    source: str
-        Complete directory and file address as a string.
+    source: str or Path
+        Complete directory and file address.
 
     Returns
     -------
@@ -94,13 +89,13 @@ def check_uri(source: str) -> bool:
 ###################################################################################################
 
 
-def load_json(source: str) -> dict:
+def load_json(source: str | Path) -> dict:
     """
     Load and return a JSON file, if it exists.
 
     Paramaters
     ----------
-    source: str
+    source: str or Path
         Filename to open, including path
 
     Raises
@@ -112,8 +107,7 @@ def load_json(source: str) -> dict:
     -------
     dict
     """
-    check_source(source)
-    with open(source, "r") as f:
+    with open(source, "r", encoding="utf-8") as f:
         try:
             return json.load(f)
         except json.decoder.JSONDecodeError:
@@ -143,6 +137,7 @@ def save_json(data: dict, source: Path, overwrite: Optional[bool] = False) -> bo
     if Path(source).exists() and not overwrite:
         e = f"`{source}` already exists. Set `overwrite` to `True`."
         raise FileExistsError(e)
-    with open(source, "w") as f:
-        json.dump(data, f, indent=4, sort_keys=True, default=str)
+    with open(source, "w", encoding="utf-8") as f:
+        # Serialise in one pass; `json.dump` issues a separate write for every encoded chunk
+        f.write(json.dumps(data, indent=4, sort_keys=True, default=str))
     return True
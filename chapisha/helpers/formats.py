@@ -2,16 +2,17 @@
 Page format and support tools.
 """
 
-from PIL import ImageDraw, ImageFont, Image
+from PIL import ImageFont
 import re
 from . import coreio as _c
 
-DIRECTORY = _c.get_helper_path() / "data" / "fonts"
+DIRECTORY = _c.DEFAULT_DATA_DIRECTORY / "fonts"
 TITLEPAGE_FONT = "PT-Serif.ttf"
 TITLEPAGE_HEIGHT = 700
 TITLEPAGE_WIDTH = 1000  # Relatively generous margin
 TITLE_SIZE = 70  # Approx 90px / 1.333 conversion factor
 AUTHOR_SIZE = 58  # Approx 75px / 1.333 conversion factor
+NEWLINES_RE = re.compile(r"\n+")
 
 
 def get_text_rows(text: str, font_size: int = TITLE_SIZE) -> list[str]:
@@ -29,37 +30,23 @@ def get_text_rows(text: str, font_size: int = TITLE_SIZE) -> list[str]:
     -------
     list of str
     """
-    rows = 1
     word_list = text.split(" ")
     font = ImageFont.truetype(str(DIRECTORY / TITLEPAGE_FONT), font_size)
-    fits_titlepage_width = False
-    while not fits_titlepage_width:
-        # Create individual text rows
+    # Measure each word once, so that any phrase width is a difference of running offsets
+    space_width = font.getlength(" ")
+    offsets = [0.0]
+    for word in word_list:
+        offsets.append(offsets[-1] + font.getlength(word) + space_width)
+    for rows in range(1, len(word_list) + 1):
+        # Create individual text rows, with the last row taking any remainder
         fitted_rows = len(word_list) // rows
-        start, end = 0, fitted_rows
-        text_rows = []
-        while end < rows * fitted_rows:
-            # get the size of the text
-            text_rows.append(" ".join(word_list[start:end]))
-            start += fitted_rows
-            end += fitted_rows
-        if word_list[start:]:
-            text_rows.append(" ".join(word_list[start:]))
+        bounds = [(i * fitted_rows, (i + 1) * fitted_rows) for i in range(rows - 1)]
+        bounds.append(((rows - 1) * fitted_rows, len(word_list)))
         # Check title rows fit
-        max_width = 0
-        for phrase in text_rows:
-            word_image = Image.new("RGBA", (0, 0), (255, 255, 255, 0))
-            draw = ImageDraw.Draw(word_image)
-            word_width = draw.textlength(phrase, font=font)
-            if word_width > max_width:
-                max_width = word_width
-        if max_width > TITLEPAGE_WIDTH:
-            # Increment the number of rows and start again
-            rows += 1
-            continue
-        # It worked
-        fits_titlepage_width = True
-    return text_rows
+        max_width = max(offsets[end] - offsets[start] - space_width for start, end in bounds)
+        if max_width <= TITLEPAGE_WIDTH:
+            break
+    return [" ".join(word_list[start:end]) for start, end in bounds]
 
 
 def get_text_paragraphs(text: str) -> list[str]:
@@ -76,10 +63,13 @@ def get_text_paragraphs(text: str) -> list[str]:
     list of str
     """
     # https://stackoverflow.com/a/64863601/295606
-    if text:
-        if isinstance(text, list):
-            text = "\n".join(text)
-        NEWLINES_RE = re.compile(r"\n{1,}")
-        text = text.strip("\n")  # remove leading and trailing "\n"
-        return [p.strip() for p in NEWLINES_RE.split(text) if p.strip()]
-    return []
+    if not text:
+        return []
+    if isinstance(text, list):
+        text = "\n".join(text)
+    # A single paragraph needs no splitting
+    if "\n" not in text:
+        text = text.strip()
+        return [text] if text else []
+    paragraphs = (p.strip() for p in NEWLINES_RE.split(text))
+    return [p for p in paragraphs if p]
@@ -4,16 +4,19 @@ Standardised XML page creation tools.
 
 import datetime
 import zoneinfo
-from bs4 import BeautifulSoup
-from copy import copy
+from copy import deepcopy
+from functools import lru_cache
+from lxml import etree
+from string import Template
 from typing import Optional
+from xml.sax.saxutils import escape
 
 from . import coreio as _c
 from . import formats
 from chapisha.models.metadata import WorkMetadata
 from chapisha.models.matter import MatterPartition, FrontMatter, Matter
 
-DATA_PATH = _c.get_helper_path() / "data"
+DATA_PATH = _c.DEFAULT_DATA_DIRECTORY
 DEFAULT_CHAPTER = "chapter-template.xhtml"
 DEFAULT_TITLEPAGE = "titlepage.xhtml"
 DEFAULT_CONTENT_OPF = "content.opf"
@@ -21,6 +24,13 @@ DEFAULT_TOC_NCX = "toc.ncx"
 DEFAULT_TOC_XHTML = "toc.xhtml"
 DEFAULT_COLOPHON_XHTML = "colophon.xhtml"
 DEFAULT_DEDICATION_XHTML = "dedication.xhtml"
+DEFAULT_TIMEZONE = zoneinfo.ZoneInfo("Europe/Paris")
+# Image file extensions whose `image/` media subtype differs from the extension
+IMAGE_MEDIA_TYPES = {"svg": "svg+xml", "jpg": "jpeg"}
+# User-supplied values are escaped before substitution; attribute values also need their quotes escaped
+XML_ATTRIBUTE_ENTITIES = {'"': "&quot;"}
+# TOC.NCX SETTINGS
+TOC_NCX_NAVPOINT = """\t\t<navPoint id="navpoint-{}" playOrder="{}">\n\t\t\t<navLabel>\n\t\t\t\t<text>{}</text>\n\t\t\t</navLabel>\n\t\t\t<content src="text/{}.xhtml"/>\n\t\t</navPoint>\n"""
 # TITLEPAGE SETTINGS
 TITLEPAGE_TITLE_HEIGHT = 90
 TITLEPAGE_TITLE_START = 150 - TITLEPAGE_TITLE_HEIGHT
@@ -29,7 +39,91 @@ TITLEPAGE_AUTHOR_HEIGHT = 75
 SECTION_SPACER = 120
 
 
-def restructure_chapter(source: bytes, title: Optional[str] = None) -> BeautifulSoup:
+@lru_cache(maxsize=None)
+def _load_template(name: str) -> str:
+    """
+    Read a default xhtml template. These are static package data, so each file is only read once.
+
+    Parameters:
+        name: Filename of the template in the `xhtml` data folder.
+
+    Returns:
+        Template text as a str.
+    """
+    with open(DATA_PATH / "xhtml" / name, "r", encoding="utf-8") as template_file:
+        return template_file.read()
+
+
+def _get_template(name: str) -> Template:
+    """
+    Load a default xhtml template. Placeholders are `${term}` fields, rendered in a single `substitute` pass.
+
+    Parameters:
+        name: Filename of the template in the `xhtml` data folder.
+
+    Returns:
+        `string.Template` for the file.
+    """
+    return Template(_load_template(name))
+
+
+@lru_cache(maxsize=None)
+def _get_chapter_skeleton() -> etree._Element:
+    """
+    Parse the default chapter xhtml once. Callers must `deepcopy` the result before modifying it.
+
+    Returns:
+        lxml xhtml root element.
+    """
+    return etree.fromstring(_load_template(DEFAULT_CHAPTER).encode("utf-8"))
+
+
+def _get_normalised_text(element: etree._Element) -> str:
+    # Equivalent to `" ".join(text.split())` on all the text contained in the element
+    return " ".join("".join(element.itertext()).split())
+
+
+@lru_cache(maxsize=8)
+def _format_creators(creator: tuple[str, ...]) -> str:
+    """
+    Join creator names for display, e.g. `A, B & C`. Shared by the titlepage and colophon, which escape the result.
+
+    Parameters:
+        creator: Creator names, as a tuple so that the result can be cached.
+
+    Returns:
+        Joined names as a str.
+    """
+    if len(creator) > 1:
+        return " & ".join((", ".join(creator[:-1]), creator[-1]))
+    return creator[0]
+
+
+def _get_spine_files(spine: list[Matter]) -> list[tuple[str, Matter]]:
+    """
+    Partition the spine once into the xhtml files written to the work, in reading order. Shared by the manifest and
+    both tables of contents.
+
+    Parameters:
+        spine: Spine and guide list of Matter, with `dedication` at 0, if present
+
+    Returns:
+        List of (file stem, Matter) tuples, e.g. `("chapter-1", matter)`.
+    """
+    dedication = FrontMatter.dedication
+    body = MatterPartition.body
+    spine_files = []
+    chapter = 1
+    for matter in spine:
+        if matter.content is dedication:
+            spine_files.append(("dedication", matter))
+        elif matter.partition is body:
+            spine_files.append((f"chapter-{chapter}", matter))
+            chapter += 1
+    return spine_files
+
+
+def restructure_chapter(source: bytes, title: Optional[str] = None) -> etree._Element:
     """
     Given an xml source, restructure the content into the default chapter xhtml format.
 
@@ -37,31 +131,33 @@ def restructure_chapter(source: bytes, title: Optional[str] = None) -> Beautiful
         source: Chapter xhtml as bytes.
 
     Returns:
-        Beautifulsoup xhtml.
+        lxml xhtml root element. Serialise with `etree.tostring`.
     """
     if not isinstance(source, bytes):
         e = "Source is not of type `bytes`."
         raise TypeError(e)
-    source = BeautifulSoup(source.decode("utf-8"), features="xml")
     # rename `media` folder to `images`
-    for img in source.find_all("img"):
-        img["src"] = img["src"].replace("../media/", "../images/")
-        # Default centering all images.
-        img["class"] = img.get("class", []) + ["center"]
-    with open(DATA_PATH / "xhtml" / DEFAULT_CHAPTER, "r+", encoding="utf-8") as dc:
-        chapter = BeautifulSoup(dc.read(), features="xml")
-        chapter.section.clear()
-        for child in source.section.children:
-            chapter.section.append(copy(child))
-        if source.h1:
-            chapter.title.string = " ".join(source.h1.getText().split())
-        elif not source.h1 and source.h2:
-            chapter.title.string = " ".join(source.h2.getText().split())
-        elif not source.h1 and not source.h2 and title:
-            chapter.title.string = " ".join(title.split())
-        else:
-            chapter.title.string = " ".join(source.title.getText().split())
-        chapter.smooth()
+    source = source.replace(b'src="../media/', b'src="../images/').replace(b"src='../media/", b"src='../images/")
+    source = etree.fromstring(source, parser=etree.XMLParser(recover=True))
+    # Default centering all images.
+    for img in source.iter("{*}img"):
+        img.set("class", " ".join(img.get("class", "").split() + ["center"]))
+    h1, h2 = source.find(".//{*}h1"), source.find(".//{*}h2")
+    if h1 is not None:
+        chapter_title = _get_normalised_text(h1)
+    elif h2 is not None:
+        chapter_title = _get_normalised_text(h2)
+    elif title:
+        chapter_title = " ".join(title.split())
+    else:
+        chapter_title = _get_normalised_text(source.find(".//{*}title"))
+    chapter = deepcopy(_get_chapter_skeleton())
+    chapter.find(".//{*}title").text = chapter_title
+    # Move the source section content into the template section
+    section = chapter.find(".//{*}section")
+    source_section = source.find(".//{*}section")
+    section.text = source_section.text
+    section[:] = list(source_section)
     return chapter
 
 
@@ -75,46 +171,37 @@ def create_titlepage_xhtml(metadata: WorkMetadata) -> str:
     Returns:
         `svg` response for `titlepage.xhtml` as a str.
     """
-    with open(DATA_PATH / "xhtml" / DEFAULT_TITLEPAGE, "r+", encoding="utf-8") as xhtml_file:
-        xml_txt = xhtml_file.read()
-        # Title
-        title_xml = ""
-        y = TITLEPAGE_TITLE_START
-        for row in formats.get_text_rows(metadata.title):
-            y += TITLEPAGE_TITLE_HEIGHT
-            title_xml += f'\t<text class="title" x="700" y="{y}">{row}</text>\n'
-            y += TITLEPAGE_ROW_MARGIN
-        xml_txt = xml_txt.replace('\t<text class="title" x="700" y="130">WORK_TITLE</text>\n', title_xml)
-        # Author/s
-        creator = metadata.creator
-        if isinstance(creator, list):
-            if len(creator) > 1:
-                creator = " &amp; ".join([", ".join(creator[:-1]), creator[-1]])
-            else:
-                creator = creator[0]
-        y += SECTION_SPACER - TITLEPAGE_ROW_MARGIN
-        author_xml = ""
-        for row in formats.get_text_rows(creator, font_size=formats.AUTHOR_SIZE):
-            y += TITLEPAGE_AUTHOR_HEIGHT
-            author_xml += f'\t<text class="author" x="700" y="{y}">{row}</text>\n'
-            y += TITLEPAGE_ROW_MARGIN
-        xml_txt = xml_txt.replace('\t<text class="author" x="700" y="290">WORK_AUTHOR</text>\n', author_xml)
-        # Chapisha boilerplate
-        y += SECTION_SPACER * 2 + TITLEPAGE_AUTHOR_HEIGHT - TITLEPAGE_ROW_MARGIN
-        xml_txt = xml_txt.replace(
-            '<text class="contributor-descriptor" x="700" y="480">Generated by Chapisha</text>',
-            f'<text class="contributor-descriptor" x="700" y="{y}">Generated by Chapisha</text>',
-        )
-        y += SECTION_SPACER - TITLEPAGE_ROW_MARGIN * 2
-        xml_txt = xml_txt.replace(
-            '<image x="650" y="540" width="100" height="100" xlink:href="../images/logo.svg" />',
-            f'<image x="650" y="{y}" width="140" height="140" xlink:href="../images/logo.svg" />',
-        )
-        y += 150
-        xml_txt = xml_txt.replace('viewBox="0 0 1400 700"', f'viewBox="0 0 1400 {y}"')
-        # Set title
-        xml_txt = xml_txt.replace("WORK_TITLE", metadata.title.upper())
-    return xml_txt
+    # Title
+    title_xml = []
+    y = TITLEPAGE_TITLE_START
+    for row in formats.get_text_rows(metadata.title):
+        y += TITLEPAGE_TITLE_HEIGHT
+        title_xml.append(f'<text class="title" x="700" y="{y}">{escape(row)}</text>')
+        y += TITLEPAGE_ROW_MARGIN
+    # Author/s
+    creator = metadata.creator
+    if isinstance(creator, list):
+        creator = _format_creators(tuple(creator))
+    y += SECTION_SPACER - TITLEPAGE_ROW_MARGIN
+    author_xml = []
+    for row in formats.get_text_rows(creator, font_size=formats.AUTHOR_SIZE):
+        y += TITLEPAGE_AUTHOR_HEIGHT
+        author_xml.append(f'<text class="author" x="700" y="{y}">{escape(row)}</text>')
+        y += TITLEPAGE_ROW_MARGIN
+    # Chapisha boilerplate
+    y += SECTION_SPACER * 2 + TITLEPAGE_AUTHOR_HEIGHT - TITLEPAGE_ROW_MARGIN
+    generator_y = y
+    y += SECTION_SPACER - TITLEPAGE_ROW_MARGIN * 2
+    logo_y = y
+    y += 150
+    return _get_template(DEFAULT_TITLEPAGE).substitute(
+        title=escape(metadata.title.upper()),
+        title_rows="\n\t\t\t\t".join(title_xml),
+        author_rows="\n\t\t\t\t".join(author_xml),
+        generator_y=generator_y,
+        logo_y=logo_y,
+        height=y,
+    )
 
 
 def create_content_opf(metadata: WorkMetadata, image_manifest: list[str], spine: list[Matter]) -> str:
@@ -129,120 +216,87 @@ def create_content_opf(metadata: WorkMetadata, image_manifest: list[str], spine:
     Returns:
         xhtml response for `content.opf` as a str.
     """
-    with open(DATA_PATH / "xhtml" / DEFAULT_CONTENT_OPF, "r+", encoding="utf-8") as opf_file:
-        opf_xml = opf_file.read()
-        ################################################################################################################
-        # METADATA
-        ################################################################################################################
-        # dc:identifier
-        opf_xml = opf_xml.replace(
-            '<dc:identifier id="uid"></dc:identifier>', f'<dc:identifier id="uid">{metadata.identifier}</dc:identifier>'
-        )
-        # dc:date
-        opf_xml = opf_xml.replace(
-            "<dc:date></dc:date>", f'<dc:date>{metadata.isodate.isoformat().split("T")[0]}T00:00:00Z</dc:date>'
-        )
-        # meta dcterms:modified date.now
-        opf_xml = opf_xml.replace(
-            '<meta property="dcterms:modified"></meta>',
-            f'<meta property="dcterms:modified">{datetime.datetime.now(zoneinfo.ZoneInfo("Europe/Paris")).isoformat("T", "seconds").split("+")[0]}Z</meta>',
-        )
-        # dc:rights
-        opf_xml = opf_xml.replace(
-            "<dc:rights></dc:rights>",
-            f"<dc:rights>{metadata.rights} For full license information see the Colophon (colophon.xhtml) included at the end of this ebook.</dc:rights>",
-        )
-        # dc:publisher
-        if metadata.publisher:
-            opf_xml = opf_xml.replace(
-                '<meta property="se:url.homepage" refines="#generator">https://github.com/whythawk/chapisha</meta>',
-                f"""<meta property="se:url.homepage" refines="#generator">https://github.com/whythawk/chapisha</meta>\n\t\t<dc:publisher id="publisher">{metadata.publisher}</dc:publisher>\n\t\t<meta property="file-as" refines="#publisher">{metadata.publisher}</meta>""",
+    ####################################################################################################################
+    # METADATA
+    ####################################################################################################################
+    # dc:publisher
+    publisher_xml = ""
+    if metadata.publisher:
+        publisher = escape(metadata.publisher)
+        publisher_xml = f"""\n\t\t<dc:publisher id="publisher">{publisher}</dc:publisher>\n\t\t<meta property="file-as" refines="#publisher">{publisher}</meta>"""
+    # dc:subject
+    subject_xml = []
+    if metadata.subject and len(metadata.subject):
+        if isinstance(metadata.subject, str):
+            metadata.subject = [metadata.subject]
+        for i, subject in enumerate(metadata.subject):
+            subject_xml.append(f'\t\t<dc:subject id="subject-{i + 1}">{escape(subject)}</dc:subject>\n')
+    # dc:description
+    description_xml = ""
+    if metadata.description:
+        description_xml = f'<dc:description id="description">{escape(metadata.description)}</dc:description>'
+    # meta long-description
+    long_description_xml = ""
+    if metadata.long_description:
+        long_description = "\n\n".join(escape(p) for p in formats.get_text_paragraphs(metadata.long_description))
+        long_description_xml = f'<meta id="long-description" property="se:long-description" refines="#description">{long_description}</meta>'
+    # meta word-count
+    word_count_xml = ""
+    if metadata.word_count:
+        word_count_xml = f'<meta property="se:word-count">{metadata.word_count}</meta>'
+    # dc:creator
+    creator_xml = []
+    for i, creator in enumerate(metadata.creator):
+        creator_xml.append(f'\t\t<dc:creator id="author-{i + 1}">{escape(creator)}</dc:creator>\n')
+    # dc:contributor
+    contributor_xml = []
+    if metadata.contributor and len(metadata.contributor):
+        for i, contributor in enumerate(metadata.contributor):
+            contributor_xml.append(
+                f'\t\t<dc:contributor id="{contributor.role.name}-{i + 1}">{escape(contributor.name)}</dc:contributor>\n'
             )
-        # dc:title
-        opf_xml = opf_xml.replace(
-            '<dc:title id="title"></dc:title>\n\t\t<meta property="file-as" refines="#title"></meta>',
-            f'<dc:title id="title">{metadata.title}</dc:title>\n\t\t<meta property="file-as" refines="#title">{metadata.title}</meta>',
-        )
-        # dc:subject
-        subject_xml = ""
-        if metadata.subject and len(metadata.subject):
-            if isinstance(metadata.subject, str):
-                metadata.subject = [metadata.subject]
-            for i, subject in enumerate(metadata.subject):
-                subject_xml += f'\t\t<dc:subject id="subject-{i + 1}">{subject}</dc:subject>\n'
-        opf_xml = opf_xml.replace('\t\t<dc:subject id="subject-1"></dc:subject>\n', subject_xml)
-        # dc:description
-        description_xml = ""
-        if metadata.description:
-            description_xml = f'<dc:description id="description">{metadata.description}</dc:description>'
-        opf_xml = opf_xml.replace('<dc:description id="description"></dc:description>', description_xml)
-        # meta long-description
-        long_description_xml = ""
-        if metadata.long_description:
-            long_description = "\n\n".join(formats.get_text_paragraphs(metadata.long_description))
-            long_description_xml = f'<meta id="long-description" property="se:long-description" refines="#description">{long_description}</meta>'
-        opf_xml = opf_xml.replace(
-            '<meta id="long-description" property="se:long-description" refines="#description"></meta>',
-            long_description_xml,
-        )
-        # dc:language
-        opf_xml = opf_xml.replace("<dc:language></dc:language>", f"<dc:language>{metadata.language}</dc:language>")
-        # meta word-count
-        word_count_xml = ""
-        if metadata.word_count:
-            word_count_xml = f'<meta property="se:word-count">{metadata.word_count}</meta>'
-        opf_xml = opf_xml.replace('<meta property="se:word-count"></meta>', word_count_xml)
-        # dc:creator
-        creator_xml = ""
-        for i, creator in enumerate(metadata.creator):
-            creator_xml += f'\t\t<dc:creator id="author-{i + 1}">{creator}</dc:creator>\n'
-        opf_xml = opf_xml.replace('\t\t<dc:creator id="author"></dc:creator>\n', creator_xml)
-        # dc:contributor
-        contributor_xml = ""
-        if metadata.contributor and len(metadata.contributor):
-            for i, contributor in enumerate(metadata.contributor):
-                contributor_xml += (
-                    f'\t\t<dc:contributor id="{contributor.role.name}-{i + 1}">{contributor.name}</dc:contributor>\n'
-                )
-        opf_xml = opf_xml.replace('\t\t<dc:contributor id="artist"></dc:contributor>\n', contributor_xml)
-        ################################################################################################################
-        # MANIFEST
-        ################################################################################################################
-        # IMAGES
-        image_manifest_xml = ""
-        for img in image_manifest:
-            media_type = img.split(".")[-1]
-            if media_type == "svg":
-                media_type = "svg+xml"
-            if media_type == "jpg":
-                media_type = "jpeg"
-            if "cover." in img:
-                image_manifest_xml += f'\t\t<item href="{img}" id="{img.replace("images/", "")}" media-type="image/{media_type}" properties="cover-image"/>\n'
-            else:
-                image_manifest_xml += (
-                    f'\t\t<item href="{img}" id="{img.replace("images/", "")}" media-type="image/{media_type}"/>\n'
-                )
-        opf_xml = opf_xml.replace(
-            '\t\t<item href="images/titlepage.png" id="titlepage.png" media-type="image/png"/>\n', image_manifest_xml
-        )
-        # CHAPTERS
-        chapter_manifest_xml = ""
-        spine_xml = ""
-        chapter = 1
-        for matter in spine:
-            if matter.content == FrontMatter.dedication:
-                chapter_manifest_xml += '\t\t<item href="text/dedication.xhtml" id="dedication.xhtml" media-type="application/xhtml+xml"/>\n'
-                spine_xml += '\t\t<itemref idref="dedication.xhtml"/>\n'
-            if matter.partition == MatterPartition.body:
-                chapter_manifest_xml += f'\t\t<item href="text/chapter-{chapter}.xhtml" id="chapter-{chapter}.xhtml" media-type="application/xhtml+xml"/>\n'
-                spine_xml += f'\t\t<itemref idref="chapter-{chapter}.xhtml"/>\n'
-                chapter += 1
-        opf_xml = opf_xml.replace(
-            '\t\t<item href="text/chapter-1.xhtml" id="chapter-1.xhtml" media-type="application/xhtml+xml"/>\n',
-            chapter_manifest_xml,
+    ####################################################################################################################
+    # MANIFEST
+    ####################################################################################################################
+    # IMAGES
+    image_manifest_xml = []
+    for img in image_manifest:
+        extension = img.rpartition(".")[2]
+        media_type = IMAGE_MEDIA_TYPES.get(extension, extension)
+        if img.startswith("images/cover."):
+            image_manifest_xml.append(
+                f'\t\t<item href="{img}" id="{img.replace("images/", "")}" media-type="image/{media_type}" properties="cover-image"/>\n'
+            )
+        else:
+            image_manifest_xml.append(
+                f'\t\t<item href="{img}" id="{img.replace("images/", "")}" media-type="image/{media_type}"/>\n'
+            )
+    # CHAPTERS
+    chapter_manifest_xml = []
+    spine_xml = []
+    for stem, _ in _get_spine_files(spine):
+        chapter_manifest_xml.append(
+            f'\t\t<item href="text/{stem}.xhtml" id="{stem}.xhtml" media-type="application/xhtml+xml"/>\n'
         )
-        opf_xml = opf_xml.replace('\t\t<itemref idref="chapter-1.xhtml"/>\n', spine_xml)
-    return opf_xml
+        spine_xml.append(f'\t\t<itemref idref="{stem}.xhtml"/>\n')
+    return _get_template(DEFAULT_CONTENT_OPF).substitute(
+        identifier=escape(metadata.identifier),
+        date=f"{metadata.isodate.isoformat()}T00:00:00Z",
+        modified=datetime.datetime.now(DEFAULT_TIMEZONE).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        rights=escape(metadata.rights),
+        publisher=publisher_xml,
+        title=escape(metadata.title),
+        subjects="".join(subject_xml),
+        description=description_xml,
+        long_description=long_description_xml,
+        language=escape(metadata.language),
+        word_count=word_count_xml,
+        creators="".join(creator_xml),
+        contributors="".join(contributor_xml),
+        images="".join(image_manifest_xml),
+        chapters="".join(chapter_manifest_xml),
+        itemrefs="".join(spine_xml),
+    )
 
 
 def create_toc_ncx(metadata: WorkMetadata, spine: list[Matter]) -> str:
@@ -256,35 +310,14 @@ def create_toc_ncx(metadata: WorkMetadata, spine: list[Matter]) -> str:
     Returns:
         xhtml response for `toc.ncx` as a str.
     """
-    with open(DATA_PATH / "xhtml" / DEFAULT_TOC_NCX, "r+", encoding="utf-8") as toc_file:
-        toc_xml = toc_file.read()
-        ################################################################################################################
-        # METADATA
-        ################################################################################################################
-        # dc:identifier
-        toc_xml = toc_xml.replace(
-            '<meta content="" name="dtb:uid"/>', f'<meta name="dtb:uid" content="{metadata.identifier}"/>'
-        )
-        ################################################################################################################
-        # NAVMAP
-        ################################################################################################################
-        navpoint = """\t\t<navPoint id="navpoint-{}" playOrder="{}">\n\t\t\t<navLabel>\n\t\t\t\t<text>{}</text>\n\t\t\t</navLabel>\n\t\t\t<content src="text/{}.xhtml"/>\n\t\t</navPoint>\n"""
-        navmap_xml = ""
-        navcount = 1
-        chapter = 1
-        # Add Titlepage
-        navmap_xml += navpoint.format(navcount, navcount, "Title page", "titlepage")
-        for matter in spine:
-            navcount += 1
-            if matter.content == FrontMatter.dedication:
-                navmap_xml += navpoint.format(navcount, navcount, matter.title, "dedication")
-            if matter.partition == MatterPartition.body:
-                navmap_xml += navpoint.format(navcount, navcount, matter.title, f"chapter-{chapter}")
-                chapter += 1
-        # Add Colophon
-        navmap_xml += navpoint.format(navcount + 1, navcount + 1, "Colophon", "colophon")
-        toc_xml = toc_xml.replace(navpoint.format(1, 1, "Title page", "titlepage"), navmap_xml)
-    return toc_xml
+    # Titlepage, then the spine, then Colophon
+    rows = [("Title page", "titlepage")]
+    rows.extend((matter.title, stem) for stem, matter in _get_spine_files(spine))
+    rows.append(("Colophon", "colophon"))
+    navmap_xml = "".join(
+        TOC_NCX_NAVPOINT.format(i, i, escape(title), stem) for i, (title, stem) in enumerate(rows, start=1)
+    )
+    return _get_template(DEFAULT_TOC_NCX).substitute(identifier=escape(metadata.identifier), navmap=navmap_xml)
 
 
 def create_toc_xhtml(metadata: WorkMetadata, spine: list[Matter]) -> str:
@@ -298,28 +331,13 @@ def create_toc_xhtml(metadata: WorkMetadata, spine: list[Matter]) -> str:
     Returns:
         xhtml response for `toc.xhtml` as a str.
     """
-    with open(DATA_PATH / "xhtml" / DEFAULT_TOC_XHTML, "r+", encoding="utf-8") as toc_file:
-        toc_xml = toc_file.read()
-        # Table of Contents
-        toc_xhtml = ""
-        chapter = 1
-        for matter in spine:
-            if matter.content == FrontMatter.dedication:
-                toc_xhtml += (
-                    f'\t\t\t\t<li>\n\t\t\t\t\t<a href="text/dedication.xhtml">{matter.title}</a>\n\t\t\t\t</li>\n'
-                )
-            if matter.partition == MatterPartition.body:
-                toc_xhtml += f'\t\t\t\t<li>\n\t\t\t\t\t<a href="text/chapter-{chapter}.xhtml">{matter.title}</a>\n\t\t\t\t</li>\n'
-                chapter += 1
-        toc_xml = toc_xml.replace(
-            '\t\t\t\t<li>\n\t\t\t\t\t<a href="text/chapter-1.xhtml"></a>\n\t\t\t\t</li>\n', toc_xhtml
+    # Table of Contents
+    toc_xhtml = []
+    for stem, matter in _get_spine_files(spine):
+        toc_xhtml.append(
+            f'\t\t\t\t<li>\n\t\t\t\t\t<a href="text/{stem}.xhtml">{escape(matter.title)}</a>\n\t\t\t\t</li>\n'
         )
-        # Landmark Title
-        toc_xml = toc_xml.replace(
-            '<a href="text/chapter-1.xhtml" epub:type="bodymatter z3998:fiction">WORK_TITLE</a>',
-            f'<a href="text/chapter-1.xhtml" epub:type="bodymatter z3998:fiction">{metadata.title}</a>',
-        )
-    return toc_xml
+    return _get_template(DEFAULT_TOC_XHTML).substitute(toc="".join(toc_xhtml), title=escape(metadata.title))
 
 
 def create_colophon_xhtml(metadata: WorkMetadata) -> str:
@@ -332,49 +350,46 @@ def create_colophon_xhtml(metadata: WorkMetadata) -> str:
     Returns:
         xhtml response for `colophon.xhtml` as a str.
     """
-    with open(DATA_PATH / "xhtml" / DEFAULT_COLOPHON_XHTML, "r+", encoding="utf-8") as xml_file:
-        xml_txt = xml_file.read()
-        # Set title
-        xml_txt = xml_txt.replace("WORK_TITLE", metadata.title.upper())
-        # Set author/s
-        creator = metadata.creator
-        if isinstance(creator, list):
-            if len(creator) > 1:
-                creator = " &amp; ".join([", ".join(creator[:-1]), creator[-1]])
-            else:
-                creator = creator[0]
-        xml_txt = xml_txt.replace("AUTHOR, YEAR. RIGHTS.", f"{creator}, {metadata.isodate.year}. {metadata.rights}")
-        # Set author url
-        xml_url = ""
-        if metadata.work_uri and metadata.work_uri.host:
-            xml_url = f'<p><a href="{metadata.work_uri}">{metadata.work_uri.host}</a><br/></p>'
-        xml_txt = xml_txt.replace('<p><a href="AUTHOR_URL">AUTHOR_URL</a><br/></p>', xml_url)
-        # Set publication long-rights
-        xml_rights = ""
-        for p in formats.get_text_paragraphs(metadata.long_rights):
-            xml_rights += f"\t\t\t<p>{p}</p>\n"
-        xml_txt = xml_txt.replace("\t\t\t<p>PUBLICATION_RIGHTS</p>\n", xml_rights)
-        # Set publisher and publisher url
-        xml_pub = ""
-        if metadata.publisher:
-            xml_pub = f"<p><br/>Published by {metadata.publisher}.</p>"
-        if metadata.publisher_uri:
-            xml_pub = f'<p><br/>Published by <a href="{metadata.publisher_uri}">{metadata.publisher}</a>.</p>'
-        xml_txt = xml_txt.replace("<p><br/>Published by PUBLISHER.</p>", xml_pub)
-        # Set contributors
-        xml_ctrb = ""
-        for ctrb in [] if not metadata.contributor else metadata.contributor:
-            # https://stackoverflow.com/a/38821619/295606
-            if not ctrb.name:
-                continue
-            # If ctrb.year is None, then use work year
-            if not ctrb.year:
-                ctrb.year = metadata.isodate.year
-            xml_ctrb += (
-                f"<p>{ctrb.role.capitalize()} contribution is copyright (c) {ctrb.name}, {ctrb.year}. {ctrb.terms}</p>"
-            )
-        xml_txt = xml_txt.replace("<p>CONTRIBUTORS</p>", xml_ctrb)
-    return xml_txt
+    # Set author/s
+    creator = metadata.creator
+    if isinstance(creator, list):
+        creator = _format_creators(tuple(creator))
+    # Set author url
+    xml_url = ""
+    if metadata.work_uri and metadata.work_uri.host:
+        xml_url = f'<p><a href="{escape(str(metadata.work_uri), XML_ATTRIBUTE_ENTITIES)}">{escape(metadata.work_uri.host)}</a><br/></p>'
+    # Set publication long-rights
+    xml_rights = []
+    for p in formats.get_text_paragraphs(metadata.long_rights):
+        xml_rights.append(f"\t\t\t<p>{escape(p)}</p>\n")
+    # Set publisher and publisher url
+    xml_pub = ""
+    if metadata.publisher and metadata.publisher_uri:
+        xml_pub = f'<p><br/>Published by <a href="{escape(str(metadata.publisher_uri), XML_ATTRIBUTE_ENTITIES)}">{escape(metadata.publisher)}</a>.</p>'
+    elif metadata.publisher:
+        xml_pub = f"<p><br/>Published by {escape(metadata.publisher)}.</p>"
+    # Set contributors
+    xml_ctrb = []
+    for ctrb in [] if not metadata.contributor else metadata.contributor:
+        # https://stackoverflow.com/a/38821619/295606
+        if not ctrb.name:
+            continue
+        # If ctrb.year is None, then use work year
+        if not ctrb.year:
+            ctrb.year = metadata.isodate.year
+        xml_ctrb.append(
+            f"<p>{ctrb.role.capitalize()} contribution is copyright (c) {escape(ctrb.name)}, {ctrb.year}. {escape(ctrb.terms or "")}</p>"
+        )
+    return _get_template(DEFAULT_COLOPHON_XHTML).substitute(
+        title=escape(metadata.title.upper()),
+        creator=escape(creator),
+        year=metadata.isodate.year,
+        rights=escape(metadata.rights),
+        work_uri=xml_url,
+        long_rights="".join(xml_rights),
+        publisher=xml_pub,
+        contributors="".join(xml_ctrb),
+    )
 
 
 def create_dedication_xhtml(dedication: str | list[str]) -> str:
@@ -387,12 +402,6 @@ def create_dedication_xhtml(dedication: str | list[str]) -> str:
     Returns:
         xhtml response for `dedication.xhtml` as a str.
     """
-    if isinstance(dedication, list):
-        dedication = "\n".join(dedication)
-    with open(DATA_PATH / "xhtml" / DEFAULT_DEDICATION_XHTML, "r+", encoding="utf-8") as xml_file:
-        xml_txt = xml_file.read()
-        ddctn_xml = ""
-        for p in formats.get_text_paragraphs(dedication):
-            ddctn_xml += f"\t\t\t<p>{p}</p>\n"
-        xml_txt = xml_txt.replace("\t\t\tDEDICATION\n", ddctn_xml)
-    return xml_txt
+    # `get_text_paragraphs` accepts either form, and returns a one-string dedication without splitting
+    ddctn_xml = "".join(f"\t\t\t\t<p>{escape(p)}</p>\n" for p in formats.get_text_paragraphs(dedication))
+    return _get_template(DEFAULT_DEDICATION_XHTML).substitute(dedication=ddctn_xml)
@@ -7,6 +7,9 @@ import shutil
 from typing import Optional
 from pathlib import Path
 
+# Replacements up to this size are held in memory, rather than written to a temporary file on disk
+DEFAULT_SPOOL_SIZE = 512 * 1024
+
 
 class UpdateZipFile(ZipFile):
     """
@@ -76,8 +79,9 @@ class UpdateZipFile(ZipFile):
         # If the file exits, and needs to be overridden,
         # mark the entry, and create a temp-file for it
         # we allow this only if the with statement is used
-        if self._allow_updates and name in self.namelist():
-            temp_file = self._replace[name] = self._replace.get(name, tempfile.TemporaryFile())
+        # (`NameToInfo` is the dict behind `namelist()`, so this is a lookup, not a list scan)
+        if self._allow_updates and name in self.NameToInfo:
+            temp_file = self._get_temp_file(name)
             temp_file.write(data)
         # Otherwise just act normally
         else:
@@ -106,8 +110,8 @@ class UpdateZipFile(ZipFile):
         # If the file exits, and needs to be overridden,
         # mark the entry, and create a temp-file for it
         # we allow this only if the with statement is used
-        if self._allow_updates and arcname in self.namelist():
-            temp_file = self._replace[arcname] = self._replace.get(arcname, tempfile.TemporaryFile())
+        if self._allow_updates and arcname in self.NameToInfo:
+            temp_file = self._get_temp_file(arcname)
             with open(filename, "rb") as source:
                 shutil.copyfileobj(source, temp_file)
         # Otherwise just act normally
@@ -140,20 +144,27 @@ class UpdateZipFile(ZipFile):
             self._close_all_temp_files()
             self._allow_updates = False
 
+    def _get_temp_file(self, name: str):
+        # Reuse the replacement for `name` if one exists, otherwise spool a new one
+        if name not in self._replace:
+            self._replace[name] = tempfile.SpooledTemporaryFile(max_size=DEFAULT_SPOOL_SIZE)
+        return self._replace[name]
+
     def _close_all_temp_files(self):
         for temp_file in self._replace.values():
             if hasattr(temp_file, "close"):
                 temp_file.close()
 
     def _rebuild_zip(self):
-        tempdir = tempfile.mkdtemp()
+        # Build the new zip alongside the original, so that overriding it is a rename on the same filesystem
+        temp_zip = tempfile.NamedTemporaryFile(dir=os.path.dirname(self.filename), suffix=".zip", delete=False)
         try:
-            temp_zip_path = os.path.join(tempdir, "new.zip")
             with ZipFile(self.filename, "r") as zip_read:
                 # Create new zip with assigned properties
-                with ZipFile(
-                    temp_zip_path, "w", compression=self.compression, allowZip64=self._allowZip64
-                ) as zip_write:
+                with (
+                    temp_zip,
+                    ZipFile(temp_zip, "w", compression=self.compression, allowZip64=self._allowZip64) as zip_write,
+                ):
                     for item in zip_read.infolist():
                         # Check if the file should be replaced / or deleted
                         replacement = self._replace.get(item.filename, None)
@@ -164,15 +175,19 @@ class UpdateZipFile(ZipFile):
                         # If marked for replacement, copy temp_file, instead of old file
                         elif replacement is not None:
                             del self._replace[item.filename]
-                            # Write replacement to archive,
+                            # Stream replacement to archive,
                             # and then close it (deleting the temp file)
                             replacement.seek(0)
-                            data = replacement.read()
+                            with zip_write.open(item, "w") as dest:
+                                shutil.copyfileobj(replacement, dest)
                             replacement.close()
                         else:
-                            data = zip_read.read(item.filename)
-                        zip_write.writestr(item, data)
-            # Override the archive with the updated one
-            shutil.move(temp_zip_path, self.filename)
+                            # Stream the original member across without holding it in memory
+                            with zip_read.open(item) as src, zip_write.open(item, "w") as dest:
+                                shutil.copyfileobj(src, dest)
+            # Override the archive with the updated one, keeping its permissions
+            shutil.copymode(self.filename, temp_zip.name)
+            os.replace(temp_zip.name, self.filename)
         finally:
-            shutil.rmtree(tempdir)
+            if os.path.exists(temp_zip.name):
+                os.remove(temp_zip.name)
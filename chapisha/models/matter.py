@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Union, Optional
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class MatterPartition(str, Enum):
@@ -65,6 +65,8 @@ class Matter(BaseModel):
     Back matter.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     partition: MatterPartition = Field(..., description="Major partition for the work.")
     content: Optional[Union[FrontMatter, BodyMatter, BackMatter]] = Field(
         None, description="Material to be included in the work. If none provided, is a chapter by default."
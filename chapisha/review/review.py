@@ -1,12 +1,33 @@
-from pathlib import Path
+import io
+from pathlib import Path, PurePosixPath
+from zipfile import ZipFile
 from bs4 import BeautifulSoup
+from lxml import etree
 from PIL import Image
 from epubcheck import EpubCheck
 
 from chapisha.helpers.updatezipfile import UpdateZipFile
+from chapisha.helpers.pages import IMAGE_MEDIA_TYPES
 from chapisha.models.metadata import DublinCoreMetadata, WorkMetadata, ContributorRoles
 from chapisha.helpers import coreio as _c
 
+CONTAINER_NAMESPACES = {"container": "urn:oasis:names:tc:opendocument:xmlns:container"}
+OPF_NAMESPACES = {"opf": "http://www.idpf.org/2007/opf", "dc": "http://purl.org/dc/elements/1.1/"}
+# Compiled once, and evaluated against the parsed `container.xml` and `content.opf` roots
+ROOTFILE_XPATH = etree.XPath("container:rootfiles/container:rootfile/@full-path", namespaces=CONTAINER_NAMESPACES)
+DC_XPATH = etree.XPath("opf:metadata/dc:*", namespaces=OPF_NAMESPACES)
+MANIFEST_XPATH = etree.XPath("opf:manifest/opf:item", namespaces=OPF_NAMESPACES)
+MANIFEST_ITEM_XPATH = etree.XPath("opf:manifest/opf:item[@id = $id]", namespaces=OPF_NAMESPACES)
+COVER_XPATH = etree.XPath("opf:manifest/opf:item[@properties='cover-image']/@href", namespaces=OPF_NAMESPACES)
+# Image decoders make many small reads, so archive members handed to Pillow are read through a buffer
+IMAGE_BUFFER_SIZE = 64 * 1024
+# Dublin Core terms, as they are named in the OPF, and those which may be repeated
+DC_FIELDS = tuple(v.alias or k for k, v in DublinCoreMetadata.model_fields.items())
+DC_LIST_FIELDS = frozenset(["creator", "contributor", "subject"])
+# Chapisha writes contributor ids as `{role}-{n}`, see `pages.create_content_opf`. Other ids fall back to `from_text`.
+ROLE_BY_ID = {role.name: role for role in ContributorRoles}
+SPINE_XPATH = etree.XPath("opf:spine/opf:itemref/@idref", namespaces=OPF_NAMESPACES)
+
 
 class ReviewWork:
     """
@@ -23,6 +44,15 @@ class ReviewWork:
 
         work = ReviewWork(source)
         ```
+
+        The archive, and its parsed package document, are held open between reviews. Use as a context manager, or
+        call `close`, to release them:
+
+        ```python
+        with ReviewWork(source) as work:
+            metadata = work.get_metadata()
+            thumbnail = work.get_thumbnail()
+        ```
     """
 
     def __init__(self, source: str | Path):
@@ -30,42 +60,87 @@ class ReviewWork:
         self.source = source
         if isinstance(source, str):
             self.source = Path(source)
+        # Lazily opened by `_open`, and released by `close`
+        self._zip = None
+        self._opf_path = None
+        self._opf_xml = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def _open(self) -> etree._Element:
+        """
+        Open the archive and parse its package document, once, caching both for subsequent reviews.
+
+        Returns:
+            Root element of the parsed `content.opf`.
+        """
+        if self._zip is None:
+            # Reviews only read the archive; `replace_image` opens its own `UpdateZipFile` to write
+            w = ZipFile(self.source, "r")
+            try:
+                container_xml = etree.fromstring(w.read("META-INF/container.xml"))
+                opf_path = ROOTFILE_XPATH(container_xml)[0]
+                opf_xml = etree.fromstring(w.read(opf_path))
+            except Exception:
+                w.close()
+                raise
+            self._zip, self._opf_path, self._opf_xml = w, opf_path, opf_xml
+        return self._opf_xml
+
+    def close(self):
+        """
+        Release the archive, if open. Any later review will reopen it.
+        """
+        if self._zip is not None:
+            self._zip.close()
+        self._zip = None
+        self._opf_path = None
+        self._opf_xml = None
 
     def replace_image(self, source: str | Path, replace: str):
         if isinstance(source, str):
             source = Path(source)
+        # The archive is rebuilt on update, so the cached copy is stale
+        self.close()
         # Open the epub
         with UpdateZipFile(self.source, "a") as w:
-            # Replace the file in `/images`
+            # Replace the file in `/images`. Updates are applied per archive name when the archive is rebuilt on exit,
+            # so a same-named replacement must not also be marked for removal.
             w.write(source, f"EPUB/images/{source.name}")
-            w.remove_file(f"EPUB/images/{replace}")
-            # Update the manifest
-            opf_xml = w.read("EPUB/content.opf")
-            opf_xml = BeautifulSoup(opf_xml.decode("utf-8"), features="xml")
-            opf_xml.manifest.find_all("item")
-            original_image_manifest_xml = str(opf_xml.find(id=replace))
-            image_manifest_xml = ""
-            media_type = source.name.split(".")[-1]
-            if media_type == "svg":
-                media_type = "svg+xml"
-            if media_type == "jpg":
-                media_type = "jpeg"
-            image_manifest_xml += (
-                f'<item href="images/{source.name}" id="{source.name}" media-type="image/{media_type}"/>\n'
-            )
-            opf_xml = str(opf_xml).replace(str(original_image_manifest_xml), image_manifest_xml)
-            w.writestr("EPUB/content.opf", opf_xml)
-            # Process in the text
+            if source.name != replace:
+                w.remove_file(f"EPUB/images/{replace}")
+            # Update the manifest, swapping the original item for the new image in place
+            opf_xml = etree.fromstring(w.read("EPUB/content.opf"))
+            extension = source.name.rpartition(".")[2]
+            media_type = IMAGE_MEDIA_TYPES.get(extension, extension)
+            original_item = MANIFEST_ITEM_XPATH(opf_xml, id=replace)
+            if original_item:
+                item = etree.Element(original_item[0].tag)
+                item.tail = original_item[0].tail
+                original_item[0].getparent().replace(original_item[0], item)
+            else:
+                item = etree.SubElement(opf_xml.find("{*}manifest"), f"{{{OPF_NAMESPACES['opf']}}}item")
+            item.set("href", f"images/{source.name}")
+            item.set("id", source.name)
+            item.set("media-type", f"image/{media_type}")
+            w.writestr("EPUB/content.opf", etree.tostring(opf_xml, encoding="utf-8", xml_declaration=True))
+            # Process in the text, only parsing those chapters which reference the image
+            replace_bytes = replace.encode("utf-8")
             for chapter in [f for f in w.namelist() if f.startswith("EPUB/text/")]:
                 try:
                     chapter_xml = w.read(chapter)
                 except KeyError:
                     continue
-                chapter_xml = BeautifulSoup(chapter_xml.decode("utf-8"), features="xml")
+                if replace_bytes not in chapter_xml:
+                    continue
+                chapter_xml = BeautifulSoup(chapter_xml, features="lxml-xml")
                 has_replaced = False
                 for img in chapter_xml.find_all("img"):
                     if img["src"].endswith(replace):
-                        print(replace, source.name)
                         has_replaced = True
                         img["src"] = img["src"].replace(replace, source.name)
                 if has_replaced:
@@ -74,59 +149,62 @@ class ReviewWork:
 
     def get_metadata(self) -> WorkMetadata:
         response = {}
-        with UpdateZipFile(self.source, "a") as w:
-            # DublinCore
-            container_xml = w.read("META-INF/container.xml")
-            container_xml = BeautifulSoup(container_xml.decode("utf-8"), features="xml")
-            opf_xml = w.read(container_xml.rootfile["full-path"])
-            opf_xml = BeautifulSoup(opf_xml.decode("utf-8"), features="xml")
-            for dc in [k if not v.alias else v.alias for k, v in DublinCoreMetadata.model_fields.items()]:
-                if dc not in ["creator", "contributor", "subject"]:
-                    text = opf_xml.find(f"dc:{dc}")
-                    if text:
-                        response[dc] = text.text
+        # DublinCore
+        opf_xml = self._open()
+        # Group the `dc:*` elements by term in a single pass over the metadata
+        dc_xml = {}
+        for element in DC_XPATH(opf_xml):
+            dc_xml.setdefault(etree.QName(element).localname, []).append(element)
+        for dc in DC_FIELDS:
+            texts = dc_xml.get(dc, [])
+            if dc not in DC_LIST_FIELDS:
+                text = "".join(texts[0].itertext()) if texts else ""
+                if text:
+                    response[dc] = text
+            else:
+                if dc != "contributor":
+                    response[dc] = ["".join(t.itertext()) for t in texts]
                 else:
-                    texts = opf_xml.find_all(f"dc:{dc}")
-                    if dc != "contributor":
-                        response[dc] = [t.text for t in texts]
-                    else:
-                        response[dc] = []
-                        for t in texts:
-                            role = ContributorRoles.from_text(t.get("id"))
-                            if role:
-                                response[dc].append({"role": role, "name": t.text})
-            # Wordcount
-            self.metadata = WorkMetadata(**response)
-            self.metadata.word_count = 0
-            chapters = []
-            for i in [i.get("idref") for i in opf_xml.spine.find_all("itemref") if i.get("idref")]:
-                chapters.extend([n for n in w.namelist() if i in n])
-            for chapter in chapters:
-                try:
-                    chapter_xml = w.read(chapter)
-                except KeyError:
-                    continue
-                words = BeautifulSoup(chapter_xml.decode("utf-8"), features="xml").section.get_text()
-                self.metadata.word_count += len(words.replace("\n", " ").replace("  ", " ").strip().split())
+                    response[dc] = []
+                    for t in texts:
+                        contributor_id = t.get("id")
+                        role = ROLE_BY_ID.get((contributor_id or "").rsplit("-", 1)[0])
+                        if role is None:
+                            role = ContributorRoles.from_text(contributor_id)
+                        if role:
+                            response[dc].append({"role": role, "name": "".join(t.itertext())})
+        # Wordcount
+        self.metadata = WorkMetadata(**response)
+        self.metadata.word_count = 0
+        # Resolve spine idrefs through the manifest, whose hrefs are relative to the OPF
+        manifest = {item.get("id"): item.get("href") for item in MANIFEST_XPATH(opf_xml)}
+        opf_directory = PurePosixPath(self._opf_path).parent
+        chapters = [str(opf_directory / manifest[i]) for i in SPINE_XPATH(opf_xml) if i in manifest]
+        for chapter in chapters:
+            try:
+                chapter_xml = self._zip.read(chapter)
+            except KeyError:
+                continue
+            section = etree.fromstring(chapter_xml, parser=etree.XMLParser(recover=True)).find(".//{*}section")
+            if section is None:
+                continue
+            words = "".join(section.itertext())
+            self.metadata.word_count += len(words.split())
         return self.metadata
 
     def get_thumbnail(self, size: tuple[int, int] = (147, 235)) -> Image.Image | None:
-        with UpdateZipFile(self.source, "a") as w:
-            # DublinCore
-            container_xml = w.read("META-INF/container.xml")
-            container_xml = BeautifulSoup(container_xml.decode("utf-8"), features="xml")
-            opf_xml = w.read(container_xml.rootfile["full-path"])
-            opf_xml = BeautifulSoup(opf_xml.decode("utf-8"), features="xml")
-            cover = opf_xml.find(attrs={"properties" : "cover-image"})
-            if cover and cover.get("href"):
-                path = cover.get("href")
-                directory = container_xml.rootfile["full-path"].split("/")
-                if len(directory) > 1:
-                    path = f"{"/".join(directory[:-1])}/{path}"
-                # https://stackoverflow.com/a/33167468/295606
-                thumb = Image.open(w.open(path))
+        opf_xml = self._open()
+        cover = COVER_XPATH(opf_xml)
+        if cover and cover[0]:
+            # The cover href is relative to the OPF
+            path = str(PurePosixPath(self._opf_path).parent / cover[0])
+            # https://stackoverflow.com/a/33167468/295606
+            with io.BufferedReader(self._zip.open(path), buffer_size=IMAGE_BUFFER_SIZE) as cover_file:
+                thumb = Image.open(cover_file)
                 thumb.thumbnail(size, Image.Resampling.LANCZOS)
-                return thumb
+                # `thumbnail` leaves a cover already within `size` undecoded, so load it before the stream is closed
+                thumb.load()
+            return thumb
         return None
 
     def validate(self) -> bool:
@@ -5,9 +5,16 @@ from pathlib import Path
 import os
 import shutil
 import base64
+import zipfile
+from lxml import etree
+from PIL import Image
 
 from chapisha import __version__
 from chapisha import CreateWork
+from chapisha import ReviewWork
+from chapisha.helpers import pages
+from chapisha.models.matter import Matter, MatterPartition
+from chapisha.models.metadata import WorkMetadata
 
 DIRECTORY = Path(__file__).resolve().parent / "data"
 TEST_DIRECTORY = Path(__file__).resolve().parent / "_test"
@@ -63,6 +70,55 @@ def _get_temporary_path(tmp_path: Path | None = None) -> Path:
     return tmp_path
 
 
+def _create_review_epub(
+    directory: Path, cover_size: tuple[int, int] = (1400, 2100), contributors: dict[str, str] | None = None
+) -> Path:
+    # Minimal EPUB, with a cover, one chapter and one figure, so that review does not depend on a build
+    source = directory / "review.epub"
+    cover = directory / "cover.jpg"
+    Image.new("RGB", cover_size, "darkred").save(cover)
+    figure = directory / "figure.png"
+    Image.new("RGB", (60, 40), "navy").save(figure)
+    with zipfile.ZipFile(source, "w") as w:
+        w.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        w.writestr(
+            "META-INF/container.xml",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">'
+            '<rootfiles><rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml"/></rootfiles>'
+            "</container>",
+        )
+        w.writestr(
+            "EPUB/content.opf",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="uid" version="3.0">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            '<dc:identifier id="uid">isbn:9780993191459</dc:identifier>'
+            "<dc:title>Usan Abasi's Lament</dc:title>"
+            '<dc:creator id="author-1">Gavin Chait</dc:creator>'
+            "<dc:date>2017-07-23T00:00:00Z</dc:date>"
+            + "".join(f'<dc:contributor id="{k}">{v}</dc:contributor>' for k, v in (contributors or {}).items())
+            + "</metadata>"
+            "<manifest>"
+            '<item href="images/cover.jpg" id="cover.jpg" media-type="image/jpeg" properties="cover-image"/>'
+            '<item href="images/figure.png" id="figure.png" media-type="image/png"/>'
+            '<item href="text/chapter-1.xhtml" id="chapter-1.xhtml" media-type="application/xhtml+xml"/>'
+            "</manifest>"
+            '<spine><itemref idref="chapter-1.xhtml"/></spine>'
+            "</package>",
+        )
+        w.writestr(
+            "EPUB/text/chapter-1.xhtml",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Chapter</title></head>'
+            "<body><section><h1>Chapter</h1><p>The brass bowl sang.</p>"
+            '<p><img src="../images/figure.png" alt="Figure"/></p></section></body></html>',
+        )
+        w.write(cover, "EPUB/images/cover.jpg")
+        w.write(figure, "EPUB/images/figure.png")
+    return source
+
+
 class TestCreateWork:
 
     def test_version(self):
@@ -97,3 +153,71 @@ class TestCreateWork:
         work.build()
         assert work.validate()
         # assert _delete_temporary_path()
+
+    def test_reopen_stateless_work(self, tmp_path):
+        work = CreateWork(tmp_path, stateless=True)
+        work.set_metadata(METADATA_PARTIAL)
+        work.add_contributor({"role": "editor", "name": "Ruth Chait"})
+        reopened = CreateWork(work.directory, stateless=True)
+        assert reopened.work_name == work.work_name
+        assert reopened.metadata == work.metadata
+
+
+class TestReviewWork:
+
+    def test_thumbnail_of_small_cover(self, tmp_path):
+        source = _create_review_epub(tmp_path, cover_size=(100, 150))
+        with ReviewWork(source) as work:
+            thumb = work.get_thumbnail()
+        assert thumb.size == (100, 150)
+        assert thumb.getpixel((0, 0))
+
+    def test_replace_image_with_same_name(self, tmp_path):
+        source = _create_review_epub(tmp_path)
+        replacement = tmp_path / "replacement" / "figure.png"
+        replacement.parent.mkdir()
+        Image.new("RGB", (90, 60), "gold").save(replacement)
+        work = ReviewWork(source)
+        work.replace_image(replacement, "figure.png")
+        with zipfile.ZipFile(source) as w:
+            assert "EPUB/images/figure.png" in w.namelist()
+            assert w.read("EPUB/images/figure.png") == replacement.read_bytes()
+            opf_xml = etree.fromstring(w.read("EPUB/content.opf"))
+        assert [i.get("href") for i in opf_xml.iterfind(".//{*}item[@id='figure.png']")] == ["images/figure.png"]
+        assert work.get_metadata().title == "Usan Abasi's Lament"
+        work.close()
+
+    def test_contributor_roles_from_ids(self, tmp_path):
+        contributors = {
+            "editor-1": "Ruth Chait",
+            "marc-editor": "Amara Okon",
+            "translator1": "Efe Ndem",
+            "type-designer": "Paratype",
+        }
+        source = _create_review_epub(tmp_path, contributors=contributors)
+        with ReviewWork(source) as work:
+            metadata = work.get_metadata()
+        assert [(c.role, c.name) for c in metadata.contributor] == [
+            ("editor", "Ruth Chait"),
+            ("editor", "Amara Okon"),
+            ("translator", "Efe Ndem"),
+        ]
+
+
+class TestPages:
+
+    def test_escaped_metadata_is_well_formed(self):
+        metadata = WorkMetadata(**{**METADATA_FULL, "title": "Usan Abasi's Lament & <Other Tales>"})
+        spine = [
+            Matter(partition="frontmatter", content="dedication", title="Dedication"),
+            Matter(partition=MatterPartition.body, title="Brass & <Bowl>"),
+        ]
+        content_opf = pages.create_content_opf(metadata, ["images/cover.jpg"], spine)
+        toc_ncx = pages.create_toc_ncx(metadata, spine)
+        toc_xhtml = pages.create_toc_xhtml(metadata, spine)
+        for xml in [content_opf, toc_ncx, toc_xhtml]:
+            etree.fromstring(xml.encode("utf-8"))
+        opf_xml = etree.fromstring(content_opf.encode("utf-8"))
+        assert opf_xml.findtext(".//{*}title") == metadata.title
+        ncx_xml = etree.fromstring(toc_ncx.encode("utf-8"))
+        assert "Brass & <Bowl>" in [t.text for t in ncx_xml.iterfind(".//{*}text")]